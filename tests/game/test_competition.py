@@ -0,0 +1,49 @@
+import asyncio
+import logging
+import types
+
+from vbet.game.competition import LeagueCompetition
+from vbet.game.user import GameSettings
+
+
+def make_competition(game_id: int = 14045) -> LeagueCompetition:
+    user = types.SimpleNamespace(username='test', settings=GameSettings())
+    return LeagueCompetition(user, game_id)
+
+
+class TestLeagueCompetition:
+    def test_init_assigns_declared_slots(self):
+        competition = make_competition()
+        assert not hasattr(competition, '__dict__')
+        assert competition.future_results_interval == 2
+
+    def test_payload_reads_current_user_settings(self):
+        competition = make_competition()
+        competition.user.settings.odd_settings_id = 7
+        competition.user.settings._unit_id = 9
+        payload = competition.resource_history({'n': 1, 'e_block_id': 5})
+        assert payload['oddSettingId'] == 7
+        assert payload['unitId'] == 9
+        assert payload['contentId'] == 14045
+
+    def test_exit_logs_failing_player_and_closes_socket(self, caplog):
+        class FailingPlayer:
+            name = 'failing'
+            closing = False
+
+            async def exit(self):
+                raise RuntimeError('exit failed')
+
+        class FakeSocket:
+            closed = False
+
+            async def exit(self):
+                self.closed = True
+
+        competition = make_competition()
+        competition.players = {'failing': FailingPlayer()}
+        competition._socket = FakeSocket()
+        with caplog.at_level(logging.ERROR, logger='competition'):
+            asyncio.run(competition.exit())
+        assert competition._socket.closed
+        assert '[test:14045] failing exit failed' in caplog.text
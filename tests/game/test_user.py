@@ -0,0 +1,103 @@
+import asyncio
+import json
+import types
+
+from vbet.core import settings
+from vbet.game.user import StoreBatcher, User
+
+
+class FakeUser:
+    def __init__(self, error: Exception = None, delay: float = 0):
+        self.error = error
+        self.delay = delay
+        self.calls = []
+
+    async def store_competition_many(self, competitions):
+        self.calls.append(competitions)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [None for _ in competitions]
+
+
+class TestStoreBatcher:
+    def test_same_tick_saves_share_a_batch(self):
+        async def run():
+            user = FakeUser()
+            batcher = StoreBatcher(user)
+            await asyncio.gather(batcher.submit(1, 10, {'a': 1}), batcher.submit(2, 20, {'b': 2}))
+            return user, batcher
+
+        user, batcher = asyncio.run(run())
+        assert user.calls == [[(1, 10, {'a': 1}), (2, 20, {'b': 2})]]
+        assert batcher.pending == {}
+
+    def test_batch_split_at_max_batch(self):
+        async def run():
+            user = FakeUser()
+            batcher = StoreBatcher(user, max_batch=2)
+            await asyncio.gather(*(batcher.submit(game_id, 1, {}) for game_id in range(5)))
+            return user
+
+        user = asyncio.run(run())
+        assert [len(call) for call in user.calls] == [2, 2, 1]
+
+    def test_store_error_reaches_every_waiter(self):
+        async def run():
+            user = FakeUser(error=OSError('disk full'))
+            batcher = StoreBatcher(user)
+            results = await asyncio.gather(batcher.submit(1, 1, {}), batcher.submit(2, 1, {}),
+                                           return_exceptions=True)
+            return results, batcher
+
+        results, batcher = asyncio.run(run())
+        assert all(isinstance(result, OSError) for result in results)
+        assert batcher.pending == {}
+
+    def test_cancelled_flush_releases_waiters(self):
+        async def run():
+            user = FakeUser(delay=10)
+            batcher = StoreBatcher(user, max_batch=1)
+            waiters = [asyncio.ensure_future(batcher.submit(game_id, 1, {})) for game_id in range(2)]
+            await asyncio.sleep(0.01)
+            batcher._task.cancel()
+            results = await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), 1)
+            return results, batcher
+
+        results, batcher = asyncio.run(run())
+        assert all(isinstance(result, asyncio.CancelledError) for result in results)
+        assert batcher.pending == {}
+        assert batcher.queue.empty()
+
+    def test_in_flight_duplicate_league_is_written_once(self):
+        # on_league_completed only saves a complete table, so a second save of the
+        # same league while the first is in flight carries the same content
+        async def run():
+            user = FakeUser(delay=0.01)
+            batcher = StoreBatcher(user)
+            first = asyncio.ensure_future(batcher.submit(1, 10, {'week': 1}))
+            await asyncio.sleep(0)
+            await asyncio.gather(first, batcher.submit(1, 10, {'week': 1}))
+            await batcher.submit(1, 10, {'week': 1})
+            return user
+
+        user = asyncio.run(run())
+        assert user.calls == [[(1, 10, {'week': 1})], [(1, 10, {'week': 1})]]
+
+    def test_failed_save_only_reaches_its_own_waiter(self, tmp_path, monkeypatch):
+        # Game 1 has no cache dir, game 2 does
+        monkeypatch.setattr(settings, 'CACHE_DIR', str(tmp_path))
+        (tmp_path / '2').mkdir()
+
+        async def run():
+            user = types.SimpleNamespace(username='test')
+            user.store_competition_many = lambda competitions: User.store_competition_many(user, competitions)
+            batcher = StoreBatcher(user)
+            return await asyncio.gather(batcher.submit(1, 10, {'a': 1}), batcher.submit(2, 20, {'b': 2}),
+                                        return_exceptions=True)
+
+        missing, stored = asyncio.run(run())
+        assert isinstance(missing, FileNotFoundError)
+        assert stored is None
+        assert json.loads((tmp_path / '2' / 'test_20.json').read_text()) == {'b': 2}
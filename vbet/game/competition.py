@@ -2,13 +2,11 @@ from __future__ import annotations
 
 import asyncio
 import time
-from datetime import datetime, timezone
-from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Callable, Coroutine, Dict, FrozenSet, List, Optional, Tuple, TYPE_CHECKING
 
 from vbet.core import settings
 from vbet.utils import exceptions
 from vbet.utils.log import get_logger
-from vbet.utils.parser import map_resource_to_name
 from vbet.utils.parser import Resource
 from . import players
 from .markets import Markets
@@ -16,14 +14,32 @@ from .table import LeagueTable
 from .tickets import Ticket
 
 if TYPE_CHECKING:
+    from vbet.game.socket import Socket
     from vbet.game.user import User
 
 
 logger = get_logger('competition')
 account_logger = get_logger('account')
 
+# Python 3.12+ can start a task synchronously until its first real suspension
+_eager_task_factory = getattr(asyncio, 'eager_task_factory', None)
+
+_CORRECT_SCORE_IDS = frozenset(str(i) for i in range(15, 43))
+_SCORE_BY_ID: Dict[str, Tuple[int, int]] = {
+    cid: (int(p[1]), int(p[2])) for cid, m in Markets['Correct_Score'].items() for p in [m['name'].split('_')]
+}
+
 
 class LeagueCompetition:
+    __slots__ = ('user', 'game_id', '_log_prefix', 'configured', 'countdown', 'offset', 'mode', 'max_week',
+                 '_all_weeks', 'event_time', 'e_block_id', 'league', 'week', 'table', 'caching', 'caching_future',
+                 'cache_enabled', 'cached', 'caching_multiple', 'caching_single', 'future_results',
+                 'future_results_interval', 'fetching_future', 'auto_skip', '_online', 'lost', 'restoring', 'phase',
+                 'required_weeks', 'history_count', 'max_history_count', 'event_time_enabled', 'event_time_interval',
+                 'profile', '_payload_template', 'event_xs', 'result_xs', 'history_xs', 'stats_xs', 'result_event',
+                 'team_labels', 'active_tickets', 'blocks', 'weeks_to_block', '_max_block_id', 'league_games',
+                 'team_index', 'socket_closed', 'jackpot_ready', 'players', '_socket', '_callbacks')
+
     SCHEDULED = 0
 
     SLEEPING = 0
@@ -34,11 +50,13 @@ class LeagueCompetition:
     def __init__(self, user: User, game_id: int):
         self.user: User = user
         self.game_id: int = game_id
+        self._log_prefix: str = f'[{user.username}:{game_id}]'
         self.configured: bool = False
         self.countdown: Optional[float] = None
         self.offset: Optional[float] = None
         self.mode: Optional[float] = None
         self.max_week: int = 38 if game_id not in [settings.BUNDESLIGA, settings.KPL] else 34
+        self._all_weeks: FrozenSet[int] = frozenset(range(1, self.max_week + 1))
         self.event_time: Optional[float] = None
         self.e_block_id: Optional[int] = None
         self.league: Optional[int] = None
@@ -51,6 +69,7 @@ class LeagueCompetition:
         self.caching_multiple: bool = False
         self.caching_single: bool = False
         self.future_results: bool = True
+        self.future_results_interval: float = 2
         self.fetching_future: bool = False
         self.auto_skip: bool = False
 
@@ -65,6 +84,7 @@ class LeagueCompetition:
         self.event_time_enabled: bool = True
         self.event_time_interval: int = 0
         self.profile: str = 'MOBILE'
+        self._payload_template: Dict = {'contentType': "PLAYLIST", 'contentId': game_id, 'profile': self.profile}
         self.event_xs: Dict[int, Dict] = {}
         self.result_xs: Dict[int, Dict] = {}
         self.history_xs: Dict[int, Dict] = {}
@@ -73,10 +93,19 @@ class LeagueCompetition:
         self.team_labels: Dict[int, str] = {}
         self.active_tickets: List[int] = []
         self.blocks: Dict[int, int] = {}
+        self.weeks_to_block: Dict[int, int] = {}
+        self._max_block_id: Optional[int] = None
         self.league_games: Dict[int, Dict] = {}
+        self.team_index: Dict[int, Dict[str, Tuple[int, Dict, str]]] = {}
         self.socket_closed: bool = False
         self.jackpot_ready: bool = False
         self.players: Dict[str, players.Player] = {}
+        self._socket: Optional[Socket] = None
+        self._callbacks: Dict[str, Callable[[int, Any, Any], Coroutine]] = {
+            Resource.EVENTS: self.events_callback,
+            Resource.RESULTS: self.results_callback,
+            Resource.HISTORY: self.history_callback
+        }
 
     @property
     def online(self):
@@ -97,6 +126,8 @@ class LeagueCompetition:
 
     # Setup
     def init(self):
+        # Socket is registered by the user before the competition is initialized
+        self._socket = self.user.get_socket(self.game_id)
         installed_players = ['ozil']
         for player in installed_players:
             mod = getattr(players, player)
@@ -114,100 +145,61 @@ class LeagueCompetition:
         await self.next_block_event()
 
     # Resources
+    def build_payload(self, **fields) -> Dict:
+        # User settings are filled in by a later sync, so they are read on every request
+        game_settings = self.user.settings
+        return dict(self._payload_template, oddSettingId=game_settings.odd_settings_id,
+                    unitId=game_settings.unit_id, **fields)
+
     def resource_events(self, options: Dict) -> Dict:
         event_time = self.get_event_time() if self.mode == self.SCHEDULED else None
         countdown = self.countdown if self.mode == self.SCHEDULED else None
         offset = self.offset if self.mode == self.SCHEDULED else None
-        return {
-            'contentType': "PLAYLIST",
-            'contentId': self.game_id,
-            'countDown': countdown,
-            'offset': offset,
-            'eventTime': event_time,
-            'n': options.get('n'),
-            'profile': self.profile,
-            'oddSettingId': self.user.settings.odd_settings_id,
-            'unitId': self.user.settings.unit_id
-        }
+        return self.build_payload(countDown=countdown, offset=offset, eventTime=event_time, n=options.get('n'))
 
     def resource_results(self, options: Dict) -> Dict:
         countdown = self.countdown if self.mode == self.SCHEDULED else None
         offset = self.offset if self.mode == self.SCHEDULED else None
-        data = {
-            'contentType': "PLAYLIST",
-            'contentId': self.game_id,
-            'countDown': countdown,
-            'offset': offset,
-            'profile': self.profile,
-            'oddSettingId': self.user.settings.odd_settings_id,
-            'unitId': self.user.settings.unit_id
-        }
+        data = self.build_payload(countDown=countdown, offset=offset)
         if self.mode == self.SCHEDULED:
             event_time = self.event_time
         else:
             event_time = None
-            data.setdefault('eBlockId', options.get('e_block_id'))
-        data.setdefault('n', options.get('n'))
-        data.setdefault('eventTime', event_time)
+            data['eBlockId'] = options.get('e_block_id')
+        data['n'] = options.get('n')
+        data['eventTime'] = event_time
         return data
 
     def resource_stats(self, options: Dict) -> Dict:
         event_time = self.get_event_time() if self.mode == self.SCHEDULED else None
         countdown = self.countdown if self.mode == self.SCHEDULED else None
         offset = self.offset if self.mode == self.SCHEDULED else None
-        return {
-            'contentType': "PLAYLIST",
-            'contentId': self.game_id,
-            'countDown': countdown,
-            'offset': offset,
-            'eBlockId': options.get('e_block_id'),
-            'eventTime': event_time,
-            'n': options.get('n'),
-            'profile': self.profile,
-            'oddSettingId': self.user.settings.odd_settings_id,
-            'unitId': self.user.settings.unit_id
-        }
+        return self.build_payload(countDown=countdown, offset=offset, eBlockId=options.get('e_block_id'),
+                                  eventTime=event_time, n=options.get('n'))
 
     def resource_history(self, options: Dict) -> Dict:
-        return {
-            'contentType': "PLAYLIST",
-            'contentId': self.game_id,
-            'countDown': None,
-            'offset': None,
-            'n': options.get('n'),
-            'eBlockId': options.get('e_block_id'),
-            'profile': self.profile,
-            'oddSettingId': self.user.settings.odd_settings_id,
-            'unitId': self.user.settings.unit_id
-        }
+        return self.build_payload(countDown=None, offset=None, n=options.get('n'), eBlockId=options.get('e_block_id'))
 
     async def next_event(self, n: int):
-        options = dict()
-        options.setdefault('n', n)
+        options = {'n': n}
         payload = self.resource_events(options)
         xs = self.send(Resource.EVENTS, payload)
         self.event_xs[xs] = payload
 
     async def next_result(self, e_block_id: int, n: int, retry_count: int = 0):
-        options = dict()
-        options.setdefault('e_block_id', e_block_id)
-        options.setdefault('n', n)
+        options = {'e_block_id': e_block_id, 'n': n}
         payload = self.resource_results(options)
         xs = self.send(Resource.RESULTS, payload)
         self.result_xs[xs] = {'payload': payload, 'retry_count': retry_count}
 
     async def next_history(self, e_block_id: int, n: int, retry_count: int = 0):
-        options = dict()
-        options.setdefault('e_block_id', e_block_id)
-        options.setdefault('n', n)
+        options = {'e_block_id': e_block_id, 'n': n}
         payload = self.resource_history(options)
         xs = self.send(Resource.HISTORY, payload)
         self.history_xs[xs] = {'payload': payload, 'retry_count': retry_count}
 
     async def next_stats(self, e_block_id: int, n: int):
-        options = dict()
-        options.setdefault('e_block_id', e_block_id)
-        options.setdefault('n', n)
+        options = {'e_block_id': e_block_id, 'n': n}
         payload = self.resource_stats(options)
         xs = self.send(Resource.STATS, payload)
         self.stats_xs[xs] = payload
@@ -312,26 +304,26 @@ class LeagueCompetition:
             week = event_data.get('matchDay', None)
             if league != self.league:
                 continue
-            logger.debug(f'[{self.user.username}:{self.game_id}] History Block: {e_block_id} League: {league} Week:'
-                         f' {week}')
+            logger.debug('%s History Block: %s League: %s Week: %s', self._log_prefix, e_block_id, league, week)
             self.blocks[e_block_id] = week
+            self.weeks_to_block[week] = e_block_id
+            if self._max_block_id is None or e_block_id > self._max_block_id:
+                self._max_block_id = e_block_id
             results = {}
             matches = {}
             winning_ids = {}
             result_ids = {}
             for event_index, event in enumerate(events):
-                data = event.get('data')
-                participants = data.get('participants')
+                data = event['data']
+                participants = data['participants']
                 player_a = participants[0]
                 player_b = participants[1]
                 team_a = player_a.get('fifaCode')
                 team_b = player_b.get('fifaCode')
                 event_id = event.get('eventId')
                 result = event.get('result')
-                odds = []  # type: List[float]
-                odd_values = data.get('oddValues')  # type: List[str]
-                for odd in odd_values:
-                    odds.append(float(odd))
+                odd_values = data['oddValues']  # type: List[str]
+                odds = tuple(map(float, odd_values))  # type: Tuple[float, ...]
                 matches[event_id] = {'A': team_a, 'B': team_b, 'odds': odds, 'index': event_index, 'participants':
                     participants}
                 if self.caching:
@@ -342,18 +334,12 @@ class LeagueCompetition:
                         half_won = result_data.get('halfWonMarkets')
                         refund_stake = result_data.get('refundMarkets')
                         handicap_data = {'half_lost': half_lost, 'half_won': half_won, 'refund_stake': refund_stake}
-                        x = set(won)
-                        y = set([str(_) for _ in range(15, 43)])
-                        r = list(x & y)
-                        z = r[0]
-                        score = Markets['Correct_Score'][z]['name'].split('_')
-                        results[event_id] = {
-                            'id': event_id, 'A': team_a, 'B': team_b,
-                            'score': (int(score[1]),
-                                      int(score[2]))}
-                        result_ids[event_id] = [int(_) for _ in won]
+                        z = next(iter(_CORRECT_SCORE_IDS.intersection(won)))
+                        results[event_id] = {'id': event_id, 'A': team_a, 'B': team_b, 'score': _SCORE_BY_ID[z]}
+                        result_ids[event_id] = list(map(int, won))
                         winning_ids[event_id] = handicap_data
             self.league_games[week] = matches
+            self.team_index.pop(week, None)
 
             if self.caching:
                 self.table.feed_result(e_block_id, league, week, results, result_ids, winning_ids)
@@ -364,19 +350,19 @@ class LeagueCompetition:
                 await self.next_history(e_block_id, -10)
             else:
                 self.caching = False
-                logger.debug(f'[{self.user.username}:{self.game_id}] History completed {self.league}')
+                logger.debug('%s History completed %s', self._log_prefix, self.league)
                 await self.dispatch_events()
         else:
             if self.caching_future:
                 missing_blocks = self.get_missing_blocks()
                 if missing_blocks:
-                    blocks = set(i for i in list(self.blocks.keys()))
-                    block_id = max(blocks)
+                    # No block of this league recorded yet, restart from the current block
+                    block_id = self._max_block_id if self._max_block_id is not None else self.e_block_id
                     await self.next_block_future(block_id)
                 else:
                     self.caching_future = False
                     self.cached = True
-                    logger.debug(f'[{self.user.username}:{self.game_id}] All events cached {self.league}')
+                    logger.debug('%s All events cached %s', self._log_prefix, self.league)
                     self.required_weeks = self.get_required_weeks()
                     await self.dispatch_events()
 
@@ -397,13 +383,16 @@ class LeagueCompetition:
                 self.auto_skip = False
 
             self.league_games = {}
+            self.team_index = {}
             self.blocks = {}
+            self.weeks_to_block = {}
+            self._max_block_id = None
             self.cached = False
             self.required_weeks = []
             self.league = league
         self.week = match_day
-        logger.debug(f'[{self.user.username}:{self.game_id}] Event Block: {self.e_block_id} League: {self.league} '
-                     f'Week: {self.week}')
+        logger.debug('%s Event Block: %s League: %s Week: %s', self._log_prefix, self.e_block_id, self.league,
+                     self.week)
         # Generate start time for on demand events
         event_time = data.get('eventTime', None)
         self.process_event_time(event_time)
@@ -412,11 +401,9 @@ class LeagueCompetition:
         stats = {}
         for event in events:
             event_id = event.get('eventId')
-            _data = event.get('data')
-            participants = _data.get('participants')
-            _data = event.get('data')
-            _stats = _data.get('stats')
-            stats[event_id] = _stats
+            _data = event['data']
+            participants = _data['participants']
+            stats[event_id] = _data.get('stats')
             player_a = participants[0]
             player_b = participants[1]
             _id_1 = player_a.get('fifaCode')
@@ -425,14 +412,12 @@ class LeagueCompetition:
             _p2 = int(player_b.get('id'))
 
             # Check if teams in our team labels
-            if _p1 not in self.team_labels:
-                self.team_labels[_p1] = _id_1
-            if _p2 not in self.team_labels:
-                self.team_labels[_p2] = _id_2
+            self.team_labels.setdefault(_p1, _id_1)
+            self.team_labels.setdefault(_p2, _id_2)
 
         if self.auto_skip:
             self.phase = LeagueCompetition.RESULTS
-            logger.debug(f'[{self.user.username}:{self.game_id}] Auto skipping league {self.league}')
+            logger.debug('%s Auto skipping league %s', self._log_prefix, self.league)
             await self.next_block_result()
         else:
             # Notify table of events
@@ -454,7 +439,7 @@ class LeagueCompetition:
     async def resource_result_process(self, data: Dict):
         e_block_id = data.get('eBlockId', None)
         week = self.get_week_by_block(e_block_id)
-        logger.debug(f'[{self.user.username}:{self.game_id}] Result Block: {e_block_id} Week : {week}')
+        logger.debug('%s Result Block: %s Week : %s', self._log_prefix, e_block_id, week)
         events = data.get('events')
         results = {}
         winning_ids = {}
@@ -468,26 +453,19 @@ class LeagueCompetition:
             half_won = result_data.get('halfWonMarkets')
             refund_stake = result_data.get('refundMarkets')
             handicap_data = {'half_lost': half_lost, 'half_won': half_won, 'refund_stake': refund_stake}
-            video_url = video_url.split('/')
+            video_url = video_url.split('/', 6)
             team_a = self.team_labels.get(int(video_url[4]))
             team_b = self.team_labels.get(int(video_url[5]))
             won = result.get('wonMarkets')
-            x = set(won)
-            y = set([str(_) for _ in range(15, 43)])
-            r = list(x & y)
-            z = r[0]
-            score = Markets['Correct_Score'][z]['name'].split('_')
-            results[event_id] = {
-                'id': event_id, 'A': team_a, 'B': team_b,
-                'score': (int(score[1]),
-                          int(score[2]))}
+            z = next(iter(_CORRECT_SCORE_IDS.intersection(won)))
+            results[event_id] = {'id': event_id, 'A': team_a, 'B': team_b, 'score': _SCORE_BY_ID[z]}
             # X is won list (wonMarketIds)
-            result_ids[event_id] = [int(_) for _ in won]
+            result_ids[event_id] = list(map(int, won))
             winning_ids[event_id] = handicap_data
 
         if self.auto_skip:
             self.phase = LeagueCompetition.EVENTS
-            logger.debug(f'[{self.user.username}:{self.game_id}] Auto skipping league {self.league}')
+            logger.debug('%s Auto skipping league %s', self._log_prefix, self.league)
             await self.next_block_event()
         else:
             self.table.feed_result(e_block_id, self.league, week, results, result_ids, winning_ids)
@@ -505,14 +483,12 @@ class LeagueCompetition:
                 not_ready = self.table.check_weeks(self.required_weeks)
                 if not not_ready:
                     self.fetching_future = False
-                    logger.debug(f'[{self.user.username}:{self.game_id}] Future result complete League : {self.league}')
+                    logger.debug('%s Future result complete League : %s', self._log_prefix, self.league)
                     await self.dispatch_events()
 
             else:
                 # Notify punters of results
-                for player in self.players.values():
-                    if player.active:
-                        await player.on_result()
+                await asyncio.gather(*(player.on_result() for player in self.players.values() if player.active))
 
                 # Attempt to resolve tickets
                 await self.user.validate_competition_tickets(self.game_id)
@@ -529,7 +505,7 @@ class LeagueCompetition:
         self.restoring = False
         e_block_id = data.get('eBlockId', None)
         if e_block_id == self.e_block_id:
-            logger.debug(f'[{self.user.username}:{self.game_id}] Competition resume success')
+            logger.debug('%s Competition resume success', self._log_prefix)
             if not self.user.demo:
                 if await self.user.resume_competition(self.game_id):
                     # Wait for player to complete ticket
@@ -540,7 +516,7 @@ class LeagueCompetition:
             else:
                 await self.next_block_result()
         else:
-            logger.debug(f'[{self.user.username}:{self.game_id}] Competition resume failed')
+            logger.debug('%s Competition resume failed', self._log_prefix)
             await self.user.reset_competition_tickets(self.game_id)
             self.reset_tickets()
             await self.resource_events_process(data)
@@ -550,7 +526,7 @@ class LeagueCompetition:
         if missing_blocks:
             self.caching_future = True
             self.cached = False
-            logger.debug(f'[{self.user.username}:{self.game_id}] Caching league {self.league} ')
+            logger.debug('%s Caching league %s ', self._log_prefix, self.league)
             await self.next_block_future(self.e_block_id)
         else:
             not_ready = self.table.check_weeks(self.required_weeks)
@@ -558,19 +534,16 @@ class LeagueCompetition:
                 asyncio.create_task(self.get_future_weeks(not_ready))
             else:
                 self.history_count = 0
-                tickets_pool = []
-                for player in self.players.values():
-                    if player.active:
-                        tickets = await player.on_event()
-                        if tickets:
-                            tickets_pool.extend(tickets)
+                player_tickets = await asyncio.gather(*(player.on_event() for player in self.players.values()
+                                                        if player.active))
+                tickets_pool = [ticket for tickets in player_tickets if tickets for ticket in tickets]
                 if tickets_pool:
                     self.phase = LeagueCompetition.TICKETS
-                    logger.debug(f'[{self.user.username}:{self.game_id}] Processing tickets : {len(tickets_pool)}')
+                    logger.debug('%s Processing tickets : %s', self._log_prefix, len(tickets_pool))
                     await self.process_tickets(tickets_pool)
                 else:
                     self.phase = LeagueCompetition.RESULTS
-                    logger.debug(f'[{self.user.username}:{self.game_id}] No Tickets available')
+                    logger.debug('%s No Tickets available', self._log_prefix)
                     await self.next_block_result()
 
     # API
@@ -578,12 +551,8 @@ class LeagueCompetition:
         return self.user.send(self.game_id, resource, payload)
 
     async def receive(self, xs: int, resource: str, payload: Dict):
-        try:
-            func_name = f'{map_resource_to_name(resource)}_callback'
-            callback = getattr(self, func_name)  # type: Callable[[int, str, Dict], Coroutine[Any]]
-        except AttributeError:
-            pass
-        else:
+        callback = self._callbacks.get(resource)
+        if callback:
             await callback(xs, resource, payload)
 
     def modify_player(self, player_name: str, odd_id: str):
@@ -611,25 +580,22 @@ class LeagueCompetition:
             self.user.register_ticket(ticket)
             await self.user.ticket_manager.add_ticket(ticket)
             self.active_tickets.append(ticket.ticket_key)
-        logger.debug(f'[{self.user.username}:{self.game_id}] Processing tickets complete : {len(tickets)}')
+        logger.debug('%s Processing tickets complete : %s', self._log_prefix, len(tickets))
 
     def serialize_ticket(self, ticket) -> Dict:
-        events = ticket.events
+        game_id = self.game_id
         event_datas = []
-        for event in events:
-            event.playlist_id = self.game_id
-            event_data = {
+        for event in ticket.events:
+            event.playlist_id = game_id
+            event_datas.append({
                 'eventId': event.event_id,
                 'gameType': {'val': event.game_type},
-                'playlistId': event.playlist_id,
+                'playlistId': game_id,
                 'eventTime': event.event_time,
                 'extId': event.ext_id,
                 'isBanker': event.is_banker,
-                'finalOutcome': event.final_outcome
-            }
-            bets = []
-            for bet in event.bets:
-                bet_data = {
+                'finalOutcome': event.final_outcome,
+                'bets': [{
                     'marketId': bet.market_id,
                     'oddId': bet.odd_id,
                     'oddName': bet.odd_name,
@@ -637,24 +603,20 @@ class LeagueCompetition:
                     'status': bet.status,
                     'profitType': bet.profit_type,
                     'stake': bet.stake
+                } for bet in event.bets],
+                'data': {
+                    'classType': 'FootballTicketEventData',
+                    'participants': event.participants,
+                    'leagueId': event.league,
+                    'matchDay': event.week,
+                    'eventNdx': event.event_ndx
                 }
-                bets.append(bet_data)
-            event_data['bets'] = bets
-            data = {
-                'classType': 'FootballTicketEventData',
-                'participants': event.participants,
-                'leagueId': event.league,
-                'matchDay': event.week,
-                'eventNdx': event.event_ndx
-            }
-            event_data['data'] = data
-            event_datas.append(event_data)
-        ticket_data = {
+            })
+        return {
             'events': event_datas,
             'systemBets': ticket.system_bets,
             'ticketType': ticket.mode
         }
-        return ticket_data
 
     def get_ticket_validation_data(self) -> Tuple[Dict, Dict]:
         return self.table.results_ids_pool, self.table.winning_ids_pool
@@ -667,24 +629,32 @@ class LeagueCompetition:
         self.active_tickets = []
 
     async def on_ticket_complete(self):
-        logger.debug(f'[{self.user.username}:{self.game_id}] Tickets completed : {len(self.active_tickets)}')
+        logger.debug('%s Tickets completed : %s', self._log_prefix, len(self.active_tickets))
         self.phase = LeagueCompetition.RESULTS
         await self.next_block_result()
 
     # Get Weeks info
     def get_missing_blocks(self) -> List:
-        all_weeks = set([i for i in range(1, self.max_week + 1)])
-        block_weeks = set(self.blocks.values())
-        return list(all_weeks - block_weeks)
+        return list(self._all_weeks - set(self.blocks.values()))
 
     def get_block_by_week(self, week: int) -> Optional[int]:
-        for block, w in self.blocks.items():
-            if w == week:
-                return block
+        return self.weeks_to_block.get(week)
 
     def get_week_by_block(self, e_block_id: int) -> Optional[int]:
         return self.blocks.get(e_block_id, None)
 
+    def get_team_event(self, week: int, team: str) -> Optional[Tuple[int, Dict, str]]:
+        week_index = self.team_index.get(week)
+        if week_index is None:
+            # Built on first lookup so competitions without team based players skip it
+            week_games = self.league_games.get(week)
+            if week_games is None:
+                return None
+            week_index = {event_data[side]: (event_id, event_data, side)
+                          for event_id, event_data in week_games.items() for side in ('A', 'B')}
+            self.team_index[week] = week_index
+        return week_index.get(team)
+
     def process_missing(self, missing: List):
         if self.cached:
             w = max(missing)
@@ -702,22 +672,17 @@ class LeagueCompetition:
         for player_name, player in self.players.items():
             player.get_required_weeks()
             used_weeks.extend(player.required_weeks)
-        all_weeks = set([i for i in range(1, self.max_week + 1)])
-        return list(all_weeks - set(used_weeks))
+        return list(self._all_weeks - set(used_weeks))
 
     async def get_future_weeks(self, weeks: List[int]):
         self.fetching_future = True
         for week in weeks:
-            e_block = self.get_block_by_week(week)
-            await asyncio.sleep(2)
-            await self.next_result(e_block, 1)
+            await asyncio.sleep(self.future_results_interval)
+            await self.next_result(self.get_block_by_week(week), 1)
 
     # Event time
     def get_event_time(self):
-        now = datetime.now(tz=timezone.utc)
-        midnight = now.replace(hour=0, minute=0, second=0)
-        time_span = int((now - midnight).total_seconds())
-        return int(now.timestamp() + self.offset)
+        return int(time.time() + self.offset)
 
     async def await_event_time(self):
         now = int(time.time())
@@ -742,25 +707,28 @@ class LeagueCompetition:
             for week, week_data in self.league_games.items():
                 week_results = self.table.get_week_results(week)
                 week_stats = self.table.get_week_stats(week)
-                week_info = {}
-                for event_id, event_data in week_data.items():
-                    team_a = event_data.get('A')
-                    team_b = event_data.get('B')
-                    odds = event_data.get('odds')
-                    event_result = week_results.get(event_id)
-                    event_stats = week_stats.get(event_id)
-                    score = list(event_result.get('score'))
-                    week_info[event_id] = {'team_a': team_a, 'team_b': team_b, 'stats': event_stats, 'odds': odds,
-                                           'score': score}
-                league_info[week] = week_info
-            await self.user.store_competition(self.game_id, self.league, league_info)
+                league_info[week] = {
+                    event_id: {'team_a': event_data['A'], 'team_b': event_data['B'],
+                               'stats': week_stats.get(event_id), 'odds': event_data.get('odds'),
+                               'score': week_results[event_id]['score']}
+                    for event_id, event_data in week_data.items()
+                }
+            await self.user.store_batcher.submit(self.game_id, self.league, league_info)
 
     # Shutdown
     async def exit(self):
-        futures = {}
-        for player_id, player in self.players.items():
+        loop = asyncio.get_running_loop()
+        players_list = list(self.players.values())
+        tasks = []
+        for player in players_list:
             player.closing = True
-            futures[player_id] = asyncio.create_task(player.exit())
-        done, p = await asyncio.wait(list(futures.values()), return_when=asyncio.ALL_COMPLETED)
-        socket = self.user.get_socket(self.game_id)
-        await socket.exit()
+            if _eager_task_factory:
+                tasks.append(_eager_task_factory(loop, player.exit()))
+            else:
+                tasks.append(loop.create_task(player.exit()))
+        if tasks:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for player, result in zip(players_list, results):
+                if isinstance(result, BaseException):
+                    logger.error('%s %s exit failed', self._log_prefix, player.name, exc_info=result)
+        await self._socket.exit()
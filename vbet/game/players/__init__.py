@@ -13,6 +13,6 @@ for (_, module_name, _) in iter_modules([package_dir]):
     if name:
         if name != 'player':
             cls = getattr(module, 'CustomPlayer')
-            setattr(module, name.capitalize(), type(name.capitalize(), (cls,), {}))
+            setattr(module, name.capitalize(), type(name.capitalize(), (cls,), {'__slots__': ()}))
 
 
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, List, Optional, Tuple, TYPE_CHECKING
+import functools
+from typing import Any, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from vbet.game.accounts import Account
 from vbet.game.markets import Markets
@@ -18,6 +19,10 @@ logger = get_logger('player')
 
 
 class Player:
+    __slots__ = ('competition', 'min_week', 'league', 'current_league_complete', '_active', 'closing', 'name',
+                 'bet_ready', 'jackpot_ready', '_bet', '_forecast', 'odd_id', 'shutdown_event', 'account',
+                 'required_weeks')
+
     def __init__(self, competition: LeagueCompetition, name: str = None):
         self.competition: LeagueCompetition = competition
         self.min_week: int = 1
@@ -54,13 +59,13 @@ class Player:
         else:
             logger.debug(f'[{self.competition.user.username}:{self.competition.game_id}] {self.name} Deactivated')
 
-    async def on_event(self) -> List[Ticket]:
+    async def on_event(self) -> Sequence[Ticket]:
         if self.competition.league != self.league:
             self.league = self.competition.league
             self.current_league_complete = False
 
         self._bet = False
-        tickets = []  # type: List[Ticket]
+        tickets = []  # type: Sequence[Ticket]
         if self.can_forecast():
             tickets = await self.forecast()
         return tickets
@@ -79,7 +84,7 @@ class Player:
     async def on_ticket_resolve(self, ticket: Ticket):
         pass
 
-    async def forecast(self) -> List[Ticket]:
+    async def forecast(self) -> Sequence[Ticket]:
         tickets = []  # type: List[Ticket]
         return tickets
 
@@ -151,6 +156,7 @@ class Player:
         return None, None
 
     @staticmethod
+    @functools.lru_cache(maxsize=512)
     def get_market_info(market: str) -> Tuple[Any, Any, Any]:
         for market_type, market_data in Markets.items():
             if market in market_data:
@@ -1,4 +1,5 @@
-from typing import Dict
+import logging
+from typing import Sequence
 
 from vbet.game.accounts import RecoverAccount
 from vbet.game.tickets import Bet, Event, Ticket
@@ -9,8 +10,13 @@ NAME = 'neymar'
 
 logger = get_logger(NAME)
 
+# Shared empty result for forecasts without a bet, callers only iterate it
+_NO_BETS = ()
+
 
 class CustomPlayer(Player):
+    __slots__ = ('team', 'event_id', 'event_data', 'last_team')
+
     def __init__(self, competition):
         super(CustomPlayer, self).__init__(competition, NAME)
         self.account = RecoverAccount(self.competition.user.account_manager)
@@ -20,41 +26,40 @@ class CustomPlayer(Player):
         self.odd_id = 0
         self.last_team = None
 
-    async def forecast(self):
+    async def forecast(self) -> Sequence[Ticket]:
         if not self.team:
-            return []
-        league_games = self.competition.league_games  # type: Dict[int, Dict]
-        week_games = league_games.get(self.competition.week)  # type: Dict[int, Dict]
-        for event_id, event_data in week_games.items():
-            player_a = event_data.get('A')
-            player_b = event_data.get('B')
-            if player_a == self.team or player_b == self.team:
-                self.event_id = event_id
-                self.event_data = event_data
-                self._bet = True
-                if player_a == self.team:
-                    self.odd_id = 210
-                else:
-                    self.odd_id = 211
-                break
+            return _NO_BETS
+        competition = self.competition
+        week = competition.week
+        team_event = competition.get_team_event(week, self.team)
+        if team_event is None:
+            # Team has no game this week, drop the previous week's event
+            self.event_id = None
+            self.event_data = {}
+            return _NO_BETS
+        self.event_id, self.event_data, side = team_event
+        self._bet = True
+        self.odd_id = 210 if side == 'A' else 211
 
         odds = self.event_data.get('odds')
-        participants = self.event_data.get('participants')
-        ticket = Ticket(self.competition.game_id, self.name)
-        event = Event(self.event_id, self.competition.league, self.competition.week, participants)
         market_id, odd_name, odd_index = Player.get_market_info(str(self.odd_id))
-        odd_value = float(odds[odd_index])
+        odd_value = odds[odd_index]
         if odd_value < 1.02:
-            return []
+            return _NO_BETS
+        participants = self.event_data.get('participants')
+        ticket = Ticket(competition.game_id, self.name)
+        event = Event(self.event_id, competition.league, week, participants)
         # stake = self.account.normalize_stake(self.account.get_stake(odd_value))
         stake = 100
         bet = Bet(self.odd_id, market_id, odd_value, odd_name, stake)
         event.add_bet(bet)
-        win = round(stake * odd_value, 2)
+        # Odds carry two decimals, so the win is exact in hundredths
+        win = stake * int(odd_value * 100 + 0.5) / 100
         min_win = win
         max_win = win
-        logger.info(f'[{self.competition.user.username}:{self.competition.game_id}] {self.name} '
-                     f'{event.get_formatted_participants()}[{self.odd_id} : {odd_value}]')
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('[%s:%s] %s %s[%s : %s]', competition.user.username, competition.game_id, self.name,
+                        event.get_formatted_participants(), self.odd_id, odd_value)
         ticket.add_event(event)
         ticket.stake = stake
         ticket.min_winning = min_win
@@ -66,7 +71,4 @@ class CustomPlayer(Player):
         return [ticket]
 
     async def on_result(self):
-        self.team = self.competition.table.table[-1].get('team')
-
-    async def on_ticket_resolve(self, ticket: Ticket):
-        pass
+        self.team = self.competition.table.last_team
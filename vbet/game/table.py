@@ -11,6 +11,7 @@ class LeagueTable:
         self.results_ids_pool: Dict = {}
         self.winning_ids_pool: Dict = {}
         self._table: List = []
+        self._last_team: Optional[str] = None
         self.ready_table: Dict = {}
         self.raw_table: Dict = {}
         self.event_block_map: Dict[int: int] = {}
@@ -20,6 +21,10 @@ class LeagueTable:
     def table(self):
         return self._table
 
+    @property
+    def last_team(self) -> Optional[str]:
+        return self._last_team
+
     def is_empty(self) -> bool:
         if self.event_block_map:
             return False
@@ -132,12 +137,14 @@ class LeagueTable:
             _table[td.get('team')] = td
         self.ready_table = _table
         self._table = data
+        self._last_team = data[-1].get('team') if data else None
 
     def clear_table(self):
         self.results_pool = {}
         self.results_ids_pool = {}
         self.winning_ids_pool = {}
         self._table = []
+        self._last_team = None
         self.raw_table = {}
         self.ready_table = {}
         self.event_block_map = {}
@@ -112,6 +112,66 @@ class GameSettings:
         return self._game_settings.get(val, {})
 
 
+class StoreBatcher:
+    def __init__(self, user: User, max_batch: int = 10):
+        self.user: User = user
+        self.max_batch: int = max_batch
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.pending: Dict[Tuple[int, int], asyncio.Future] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, game_id: int, league: int, league_info: Dict):
+        key = (game_id, league)
+        future = self.pending.get(key)
+        if future is None:
+            # Saves are keyed by league, not content: on_league_completed only fires once the
+            # table is complete, so a repeat save of an in-flight league holds the same data
+            future = asyncio.get_event_loop().create_future()
+            self.pending[key] = future
+            self.queue.put_nowait((game_id, league, league_info, future))
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self.flush())
+        await asyncio.shield(future)
+
+    async def flush(self):
+        try:
+            while not self.queue.empty():
+                # Yield once so saves submitted in the same tick join this batch
+                await asyncio.sleep(0)
+                batch = [self.queue.get_nowait() for _ in range(min(self.queue.qsize(), self.max_batch))]
+                try:
+                    errors = await self.user.store_competition_many([(game_id, league, info)
+                                                                     for game_id, league, info, _ in batch])
+                except Exception as err:
+                    for *_, future in batch:
+                        future.set_exception(err)
+                except BaseException:
+                    for *_, future in batch:
+                        future.cancel()
+                    raise
+                else:
+                    # Every waiter gets the outcome of its own league only
+                    for (*_, future), error in zip(batch, errors):
+                        if error is None:
+                            future.set_result(None)
+                        else:
+                            future.set_exception(error)
+                finally:
+                    for game_id, league, _, _ in batch:
+                        self.pending.pop((game_id, league), None)
+        except BaseException:
+            # Flush was cancelled, release every waiter still queued or in flight
+            for future in self.pending.values():
+                if not future.done():
+                    future.cancel()
+            self.pending.clear()
+            while not self.queue.empty():
+                *_, future = self.queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+            raise
+
+
 class User:
     def __init__(self, manager: UserManager, username: str, demo: bool):
         self.username: str = username
@@ -129,6 +189,7 @@ class User:
         self.settings: GameSettings = GameSettings()
         self.account_manager: AccountManager = AccountManager(self)
         self.ticket_manager: TicketManager = TicketManager(self)
+        self.store_batcher: StoreBatcher = StoreBatcher(self)
         self.jackpot_ready: bool = False
         self.game_map: List[int] = []
         self.game_map_lock: asyncio.Lock = asyncio.Lock()
@@ -469,12 +530,34 @@ class User:
             body = {'data': self.game_map}
             await afp.write(encode_json(body))
 
-    async def store_competition(self, game_id: int, league: int,  data: Dict):
+    async def store_competition_many(self, competitions: List[Tuple[int, int, Dict]]) -> List[Optional[Exception]]:
+        # Each league is encoded and written on its own, one failed save does not affect the others
+        def encode_competitions() -> List[Union[str, Exception]]:
+            dumps = []
+            for _, _, data in competitions:
+                try:
+                    dumps.append(encode_json(data))
+                except Exception as err:
+                    dumps.append(err)
+            return dumps
+
         event_loop = asyncio.get_event_loop()
-        dump_data = await event_loop.run_in_executor(None, encode_json, data)
-        async with aiofile.AIOFile(f'{settings.CACHE_DIR}/{game_id}/{self.username}_{league}.json', 'w') as afp:
-            await afp.write(dump_data)
-        logger.debug(f'[{self.username}:{game_id}] uploaded data  League: [{league}:{len(data)}]')
+        dumps = await event_loop.run_in_executor(None, encode_competitions)
+        errors = []  # type: List[Optional[Exception]]
+        for (game_id, league, data), dump_data in zip(competitions, dumps):
+            if isinstance(dump_data, Exception):
+                errors.append(dump_data)
+                continue
+            try:
+                async with aiofile.AIOFile(f'{settings.CACHE_DIR}/{game_id}/{self.username}_{league}.json',
+                                           'w') as afp:
+                    await afp.write(dump_data)
+            except Exception as err:
+                errors.append(err)
+            else:
+                errors.append(None)
+                logger.debug(f'[{self.username}:{game_id}] uploaded data  League: [{league}:{len(data)}]')
+        return errors
 
     async def exit(self):
         for competition_id, competition in self.competitions.items():